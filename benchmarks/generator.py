@@ -0,0 +1,146 @@
+import random
+
+
+BIN_OPS = ["+", "-", "*", "//", "%"]
+CMP_OPS = ["<", ">", "<=", ">=", "==", "!="]
+
+
+class ProgramGenerator:
+    """
+    Seeded generator of random programs in the Py2C subset.
+
+    Programs are valid Python: every variable is assigned before it is
+    read, divisors are non-zero constants, `while` loops count down to
+    termination and `break` / `continue` only appear inside loops.
+    """
+
+    def __init__(self, seed=0, functions=4, statements=40, max_depth=3, expr_depth=4):
+        self.rng = random.Random(seed)
+        self.functions = functions
+        self.statements = statements
+        self.max_depth = max_depth
+        self.expr_depth = expr_depth
+        self.lines = []
+        self.counter = 0
+        self.defined = []  # (name, arity) of emitted functions
+
+    def generate(self):
+        for i in range(self.functions):
+            self._gen_function(f"f{i}", self.rng.randint(1, 3))
+            self._emit(0, "")
+
+        scope = []
+        self._gen_block(scope, 0, self.statements, depth=0, in_loop=False)
+        self._emit(0, f"print({', '.join(scope[:4]) or '0'})")
+
+        return "\n".join(self.lines) + "\n"
+
+    def _emit(self, indent, line):
+        self.lines.append("    " * indent + line)
+
+    def _fresh(self, prefix="v"):
+        self.counter += 1
+        return f"{prefix}{self.counter}"
+
+    # ---------- STATEMENTS ----------
+
+    def _gen_function(self, name, arity):
+        params = [f"p{i}" for i in range(arity)]
+        self._emit(0, f"def {name}({', '.join(params)}):")
+        scope = list(params)
+        count = max(1, self.statements // 8)
+        self._gen_block(scope, 1, count, depth=1, in_loop=False, allow_print=False)
+        self._emit(1, f"return {self._expr(scope, self.expr_depth)}")
+        # Registered afterwards so functions only call earlier ones.
+        self.defined.append((name, arity))
+
+    def _gen_block(self, scope, indent, count, depth, in_loop, allow_print=True):
+        for _ in range(count):
+            self._gen_stmt(scope, indent, depth, in_loop, allow_print)
+
+    def _gen_stmt(self, scope, indent, depth, in_loop, allow_print):
+        kinds = ["assign", "assign", "update"]
+        if allow_print:
+            kinds.append("print")
+        if depth < self.max_depth:
+            kinds += ["if", "for", "while"]
+        if in_loop:
+            kinds.append("jump")
+
+        # Loop variables are readable but never reassigned.
+        mutable = [name for name in scope if not name.startswith("i")]
+
+        kind = self.rng.choice(kinds)
+        if kind == "update" and not mutable:
+            kind = "assign"
+
+        if kind == "assign":
+            name = self._fresh()
+            self._emit(indent, f"{name} = {self._expr(scope, self.expr_depth)}")
+            scope.append(name)
+
+        elif kind == "update":
+            name = self.rng.choice(mutable)
+            self._emit(indent, f"{name} = {self._expr(scope, self.expr_depth)}")
+
+        elif kind == "print":
+            self._emit(indent, f"print({self._expr(scope, self.expr_depth)})")
+
+        elif kind == "jump":
+            self._emit(indent, f"if {self._cond(scope)}:")
+            self._emit(indent + 1, self.rng.choice(["break", "continue"]))
+
+        elif kind == "if":
+            self._emit(indent, f"if {self._cond(scope)}:")
+            self._gen_block(list(scope), indent + 1, self._body_size(), depth + 1, in_loop, allow_print)
+            if self.rng.random() < 0.5:
+                self._emit(indent, "else:")
+                self._gen_block(list(scope), indent + 1, self._body_size(), depth + 1, in_loop, allow_print)
+
+        elif kind == "for":
+            var = self._fresh("i")
+            start = self.rng.randint(0, 4)
+            end = start + self.rng.randint(1, 10)
+            self._emit(indent, f"for {var} in range({start}, {end}):")
+            self._gen_block(scope + [var], indent + 1, self._body_size(), depth + 1, True, allow_print)
+
+        elif kind == "while":
+            counter = self._fresh("n")
+            self._emit(indent, f"{counter} = {self.rng.randint(1, 10)}")
+            self._emit(indent, f"while {counter} > 0:")
+            self._emit(indent + 1, f"{counter} = {counter} - 1")
+            self._gen_block(list(scope), indent + 1, self._body_size(), depth + 1, True, allow_print)
+
+    def _body_size(self):
+        return self.rng.randint(1, 4)
+
+    # ---------- EXPRESSIONS ----------
+
+    def _expr(self, scope, depth):
+        if depth <= 0 or self.rng.random() < 0.2:
+            return self._leaf(scope)
+
+        if self.defined and self.rng.random() < 0.1:
+            name, arity = self.rng.choice(self.defined)
+            args = ", ".join(self._expr(scope, depth - 1) for _ in range(arity))
+            return f"{name}({args})"
+
+        op = self.rng.choice(BIN_OPS)
+        left = self._expr(scope, depth - 1)
+        if op in ("//", "%"):
+            return f"({left} {op} {self.rng.randint(1, 9)})"
+        return f"({left} {op} {self._expr(scope, depth - 1)})"
+
+    def _leaf(self, scope):
+        if scope and self.rng.random() < 0.6:
+            return self.rng.choice(scope)
+        return str(self.rng.randint(0, 100))
+
+    def _cond(self, scope):
+        left = self._expr(scope, 2)
+        right = self._expr(scope, 2)
+        cond = f"{left} {self.rng.choice(CMP_OPS)} {right}"
+        if self.rng.random() < 0.3:
+            other = f"{self._leaf(scope)} {self.rng.choice(CMP_OPS)} {self._leaf(scope)}"
+            cond = f"{cond} {self.rng.choice(['and', 'or'])} {other}"
+        return cond
@@ -0,0 +1,144 @@
+"""
+Runtime benchmark for the loop optimization pass.
+
+Each program is compiled to C twice, with and without LoopOptimizer, built
+with the system C compiler and run. Outputs must match; the best wall
+time of each binary is reported.
+
+Usage:
+    python -m benchmarks.loops
+    python -m benchmarks.loops --cc gcc --cflags="-O1" --repeat 10
+"""
+
+import argparse
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from py2c.parser import Py2CParser
+from py2c.optimizer import ConstantFolder
+from py2c.dce import DeadCodeEliminator
+from py2c.loops import LoopOptimizer
+from py2c.codegen import CCodeGenerator
+
+
+PROGRAMS = {
+    # Polynomial accumulations -> closed form
+    "sum-of-squares": """
+def work(n):
+    total = n
+    for i in range(0, 1000):
+        total = total + i * i - 3 * i + 1
+    return total
+
+acc = 0
+for r in range(0, 200000):
+    acc = (acc + work(r)) % 1000003
+print(acc)
+""",
+    # Short constant loops -> full unrolling
+    "small-kernels": """
+def mix(a, b):
+    h = a
+    for i in range(0, 8):
+        h = (h * 31 + b + i) % 65521
+    return h
+
+acc = 1
+for r in range(0, 2000000):
+    acc = mix(acc, r)
+print(acc)
+""",
+    # Long loop with a non-linear body -> partial unrolling
+    "partial-unroll": """
+def scan(seed):
+    h = seed
+    for i in range(0, 1001):
+        h = (h * 7 + i) % 10007
+    return h
+
+acc = 0
+for r in range(0, 20000):
+    acc = scan(acc + r)
+print(acc)
+""",
+}
+
+
+def compile_to_c(source, optimize_loops):
+    ir = Py2CParser(source).parse()
+    ir = ConstantFolder().optimize(ir)
+
+    loops = LoopOptimizer()
+    if optimize_loops:
+        ir = loops.optimize(ir)
+        ir = ConstantFolder().optimize(ir)
+
+    ir = DeadCodeEliminator().eliminate(ir)
+    return CCodeGenerator().generate(ir), loops
+
+
+def build(c_code, workdir, name, cc, cflags):
+    c_path = os.path.join(workdir, f"{name}.c")
+    exe_path = os.path.join(workdir, name)
+    with open(c_path, "w") as f:
+        f.write(c_code)
+    subprocess.run([cc, *cflags, "-o", exe_path, c_path], check=True)
+    return exe_path
+
+
+def run(exe_path, repeat):
+    best = float("inf")
+    output = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = subprocess.run([exe_path], check=True, capture_output=True, text=True).stdout
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Py2C loop optimization runtime benchmark")
+    ap.add_argument("--cc", default=os.environ.get("CC", "cc"))
+    ap.add_argument("--cflags", default="-O0",
+                    help="flags for the C compiler (default -O0, so the C "
+                         "compiler does not redo the transformations)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--programs", nargs="+", choices=list(PROGRAMS), default=list(PROGRAMS))
+    args = ap.parse_args()
+
+    if shutil.which(args.cc) is None:
+        print(f"C compiler '{args.cc}' not found; set --cc or $CC")
+        sys.exit(1)
+
+    cflags = shlex.split(args.cflags)
+    mismatches = []
+
+    print(f"{'program':<18}{'baseline':>12}{'loops':>12}{'speedup':>10}")
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in args.programs:
+            base_c, _ = compile_to_c(PROGRAMS[name], optimize_loops=False)
+            opt_c, loops = compile_to_c(PROGRAMS[name], optimize_loops=True)
+
+            base_time, base_out = run(build(base_c, workdir, f"{name}-base", args.cc, cflags), args.repeat)
+            opt_time, opt_out = run(build(opt_c, workdir, f"{name}-loops", args.cc, cflags), args.repeat)
+
+            if base_out != opt_out:
+                mismatches.append(name)
+
+            print(f"{name:<18}{base_time * 1000:>10.1f}ms{opt_time * 1000:>10.1f}ms{base_time / opt_time:>9.2f}x")
+            if loops.report:
+                for line in loops.format_report().splitlines():
+                    print(f"    {line}")
+
+    if mismatches:
+        print(f"\nOutput mismatch: {', '.join(mismatches)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
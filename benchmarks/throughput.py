@@ -0,0 +1,191 @@
+"""
+Compiler-throughput benchmark.
+
+Compiles seeded random programs of increasing size and records the wall
+time and peak traced memory of each compiler stage.
+
+Usage:
+    python -m benchmarks.throughput --output baseline.json
+    python -m benchmarks.throughput --compare baseline.json
+    python -m benchmarks.throughput --compare baseline.json --threshold 0.5 --memory-threshold 0.1
+"""
+
+import argparse
+import gc
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.generator import ProgramGenerator
+from py2c.parser import Py2CParser
+from py2c.optimizer import ConstantFolder
+from py2c.dce import DeadCodeEliminator
+from py2c.loops import LoopOptimizer
+from py2c.codegen import CCodeGenerator
+
+
+# name -> ProgramGenerator keyword arguments
+CASES = {
+    "small": dict(functions=2, statements=20, max_depth=2, expr_depth=3),
+    "medium": dict(functions=8, statements=200, max_depth=3, expr_depth=4),
+    "large": dict(functions=32, statements=600, max_depth=3, expr_depth=4),
+    "deep-expr": dict(functions=2, statements=100, max_depth=2, expr_depth=10),
+}
+
+STAGES = ["parse", "optimize", "loops", "dce", "codegen"]
+
+# A slowdown must also exceed this many seconds to count; the shortest
+# stages are dominated by timer and scheduling noise.
+NOISE_FLOOR = 0.005
+
+
+def run_stage(stage, value):
+    if stage == "parse":
+        return Py2CParser(value).parse()
+    if stage == "optimize":
+        return ConstantFolder().optimize(value)
+    if stage == "loops":
+        return LoopOptimizer().optimize(value)
+    if stage == "dce":
+        return DeadCodeEliminator().eliminate(value)
+    if stage == "codegen":
+        return CCodeGenerator().generate(value)
+
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+def measure(source, repeat):
+    # Like timeit, keep the garbage collector out of the measurements:
+    # collections triggered mid-stage add timing noise and lower the
+    # traced peak depending on what earlier runs left behind.
+    gc.collect()
+    gc.disable()
+    try:
+        # Traced run first, from a fresh state, for peak memory
+        peaks = {}
+        tracemalloc.start()
+        try:
+            value = source
+            for stage in STAGES:
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                value = run_stage(stage, value)
+                peaks[stage] = tracemalloc.get_traced_memory()[1] - before
+        finally:
+            tracemalloc.stop()
+
+        # Timing runs (median of `repeat`), without tracemalloc overhead
+        samples = {stage: [] for stage in STAGES}
+        for _ in range(repeat):
+            gc.collect()
+            value = source
+            for stage in STAGES:
+                start = time.perf_counter()
+                value = run_stage(stage, value)
+                samples[stage].append(time.perf_counter() - start)
+    finally:
+        gc.enable()
+
+    return {
+        stage: {"time": statistics.median(samples[stage]), "peak_memory": peaks[stage]}
+        for stage in STAGES
+    }
+
+
+def run_benchmarks(seed, repeat, cases):
+    results = {}
+    for name in cases:
+        source = ProgramGenerator(seed=seed, **CASES[name]).generate()
+        results[name] = {
+            "lines": source.count("\n"),
+            "stages": measure(source, repeat),
+        }
+    return {"seed": seed, "repeat": repeat, "cases": results}
+
+
+def compare(baseline, current, threshold, memory_threshold):
+    regressions = []
+
+    for name, case in current["cases"].items():
+        if name not in baseline["cases"]:
+            continue
+        base_stages = baseline["cases"][name]["stages"]
+
+        for stage, metrics in case["stages"].items():
+            base = base_stages.get(stage)
+            if base is None:
+                continue
+
+            slower = metrics["time"] - base["time"]
+            if slower > NOISE_FLOOR and metrics["time"] > base["time"] * (1 + threshold):
+                regressions.append(
+                    f"{name}/{stage}: time {base['time']:.4f}s -> {metrics['time']:.4f}s"
+                )
+            if metrics["peak_memory"] > base["peak_memory"] * (1 + memory_threshold):
+                regressions.append(
+                    f"{name}/{stage}: peak memory {base['peak_memory']} -> {metrics['peak_memory']} bytes"
+                )
+
+    return regressions
+
+
+def print_report(results):
+    print(f"{'case':<12}{'lines':>8}  " + "".join(f"{s:>20}" for s in STAGES))
+    for name, case in results["cases"].items():
+        cells = "".join(
+            f"{m['time'] * 1000:>10.2f}ms {m['peak_memory'] / 1024:>6.0f}KiB"
+            for m in (case["stages"][s] for s in STAGES)
+        )
+        print(f"{name:<12}{case['lines']:>8}  {cells}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Py2C compiler-throughput benchmark")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=7)
+    ap.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    ap.add_argument("--output", help="write results to this JSON baseline file")
+    ap.add_argument("--compare", help="compare against this JSON baseline file")
+    # Wall time on a shared machine drifts by well over 50% between
+    # identical runs, so only flag stages that take about twice as long.
+    # Peak memory is deterministic and can be checked much more tightly.
+    ap.add_argument("--threshold", type=float, default=1.0,
+                    help="allowed relative slowdown (default 1.0)")
+    ap.add_argument("--memory-threshold", type=float, default=0.25,
+                    help="allowed relative peak memory growth (default 0.25)")
+    args = ap.parse_args()
+
+    # Deep expressions recurse through every pass
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10000))
+
+    results = run_benchmarks(args.seed, args.repeat, args.cases)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+
+        if baseline.get("seed") != results["seed"]:
+            print("Warning: baseline was recorded with a different seed")
+        if baseline.get("repeat") != results["repeat"]:
+            print("Warning: baseline was recorded with a different --repeat")
+
+        regressions = compare(baseline, results, args.threshold, args.memory_threshold)
+        if regressions:
+            print(f"\nRegressions beyond {args.threshold:.0%} time / "
+                  f"{args.memory_threshold:.0%} memory:")
+            for r in regressions:
+                print(f"  {r}")
+            sys.exit(1)
+
+        print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
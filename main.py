@@ -2,6 +2,7 @@ from py2c.parser import Py2CParser
 from py2c.codegen import CCodeGenerator
 from py2c.optimizer import ConstantFolder
 from py2c.dce import DeadCodeEliminator
+from py2c.loops import LoopOptimizer
 import sys
 
 
@@ -17,6 +18,9 @@ def main():
 
         # ---------- Optimize ----------
         ir = ConstantFolder().optimize(ir)
+        loops = LoopOptimizer()
+        ir = loops.optimize(ir)
+        ir = ConstantFolder().optimize(ir)
         ir = DeadCodeEliminator().eliminate(ir)
 
         # ---------- Codegen ----------
@@ -28,6 +32,11 @@ def main():
         print(c_code)
         print("")
 
+        if loops.report:
+            print("==== Loop Optimizations ====\n")
+            print(loops.format_report())
+            print("")
+
     except SyntaxError as e:
         print(f"SyntaxError: {e}")
         sys.exit(1)
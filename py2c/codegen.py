@@ -1,4 +1,21 @@
 from py2c.ir import *
+from py2c.ranges import RangeAnalyzer
+
+
+# Branch-free Python floor division / modulo, emitted only when needed.
+FLOORDIV_HELPER = [
+    "static inline int py2c_floordiv(int a, int b) {",
+    "    int q = a / b;",
+    "    return q - ((a % b != 0) & ((a ^ b) < 0));",
+    "}",
+]
+
+MOD_HELPER = [
+    "static inline int py2c_mod(int a, int b) {",
+    "    int r = a % b;",
+    "    return r + (b & -((r != 0) & ((r ^ b) < 0)));",
+    "}",
+]
 
 
 class CCodeGenerator:
@@ -6,10 +23,14 @@ class CCodeGenerator:
         self.lines = []
         self.indent = 0
         self.declared = set()
+        self.ranges = RangeAnalyzer()
+        self.env = {}
+        self.helpers = set()
 
     def generate(self, ir):
         self._emit("#include <stdio.h>")
         self._emit("")
+        helpers_at = len(self.lines)
 
         # Emit functions first
         for stmt in ir.statements:
@@ -18,8 +39,11 @@ class CCodeGenerator:
                 self._emit("")
 
         # Emit main
+        main = [s for s in ir.statements if not isinstance(s, IRFunction)]
+        self.env = self.ranges.analyze(main)
         self._emit("int main() {")
         self.indent += 1
+        self._declare(main, [])
 
         for stmt in ir.statements:
             if not isinstance(stmt, IRFunction):
@@ -29,6 +53,13 @@ class CCodeGenerator:
         self.indent -= 1
         self._emit("}")
 
+        helpers = []
+        if "floordiv" in self.helpers:
+            helpers += FLOORDIV_HELPER + [""]
+        if "mod" in self.helpers:
+            helpers += MOD_HELPER + [""]
+        self.lines[helpers_at:helpers_at] = helpers
+
         return "\n".join(self.lines)
 
     def _emit(self, line):
@@ -38,13 +69,46 @@ class CCodeGenerator:
 
     def _gen_function(self, node):
         params = ", ".join(f"int {p.name}" for p in node.params)
+        self.env = self.ranges.analyze(node.body, node.params)
         self._emit(f"int {node.name}({params}) {{")
         self.indent += 1
+        self._declare(node.body, node.params)
         for stmt in node.body:
             self._gen(stmt)
         self.indent -= 1
         self._emit("}")
 
+    def _declare(self, body, params):
+        # Each C function is its own scope. A variable is declared where it
+        # is first assigned only if that is in the function's top-level
+        # block, and a loop variable in its `for` only if that loop is its
+        # sole use; everything else is hoisted, since a C block would
+        # otherwise hide it from later statements.
+        self.declared = {p.name for p in params}
+
+        first = {}      # name -> (depth, first bound by an assignment)
+        loops = {}      # name -> IRFor nodes binding it
+        for node, depth in _bindings(body, 0):
+            if isinstance(node, IRFor):
+                first.setdefault(node.var.name, (depth, False))
+                loops.setdefault(node.var.name, []).append(node)
+            else:
+                first.setdefault(node.target.name, (depth, True))
+
+        uses = _use_counts(body, {})
+        for name, (depth, by_assign) in first.items():
+            if name in self.declared:
+                continue
+            if depth == 0 and by_assign:
+                continue  # `int name = ...;` at first assignment
+            binders = loops.get(name, [])
+            if len(binders) == 1:
+                inside = _use_counts(binders[0].body, {}).get(name, 0)
+                if uses[name] == 1 + inside:
+                    continue  # `for (int name = ...)`
+            self.declared.add(name)
+            self._emit(f"int {name};")
+
     # ---------- STATEMENTS ----------
 
     def _gen(self, node):
@@ -72,7 +136,11 @@ class CCodeGenerator:
             else:
                 init = f"{var} = {self._expr(node.start)}"
 
-            self._emit(f"for ({init}; {var} < {self._expr(node.end)}; {var} += {self._expr(node.step)}) {{")
+            # range() counts down when the step is negative
+            negative = isinstance(node.step, IRConst) and node.step.value < 0
+            test = ">" if negative else "<"
+
+            self._emit(f"for ({init}; {var} {test} {self._expr(node.end)}; {var} += {self._expr(node.step)}) {{")
             self.indent += 1
             for s in node.body:
                 self._gen(s)
@@ -80,7 +148,7 @@ class CCodeGenerator:
             self._emit("}")
 
         elif isinstance(node, IRWhile):
-            self._emit(f"while {self._expr(node.condition)} {{")
+            self._emit(f"while {self._condition(node.condition)} {{")
             self.indent += 1
             for s in node.body:
                 self._gen(s)
@@ -88,7 +156,7 @@ class CCodeGenerator:
             self._emit("}")
 
         elif isinstance(node, IRIf):
-            self._emit(f"if {self._expr(node.condition)} {{")
+            self._emit(f"if {self._condition(node.condition)} {{")
             self.indent += 1
             for s in node.then_body:
                 self._gen(s)
@@ -128,6 +196,8 @@ class CCodeGenerator:
         if isinstance(node, IRVar):
             return node.name
         if isinstance(node, IRBinOp):
+            if node.op in ("Div", "FloorDiv", "Mod"):
+                return self._division(node)
             return f"({self._expr(node.left)} {self._map_op(node.op)} {self._expr(node.right)})"
         if isinstance(node, IRCompare):
             return f"({self._expr(node.left)} {node.op} {self._expr(node.right)})"
@@ -141,11 +211,93 @@ class CCodeGenerator:
 
         raise NotImplementedError(f"Expression not supported: {type(node)}")
 
+    def _condition(self, node):
+        # C needs `if (...)`; reuse the expression's own parentheses when
+        # they enclose all of it, e.g. `(x > 0)` but not `(a) + (b)`.
+        expr = self._expr(node)
+        depth = 0
+        for i, ch in enumerate(expr):
+            depth += {"(": 1, ")": -1}.get(ch, 0)
+            if depth == 0:
+                if i == len(expr) - 1 and expr[0] == "(":
+                    return expr
+                break
+        return f"({expr})"
+
+    def _division(self, node):
+        # C truncates toward zero while Python floors; pick the cheapest
+        # lowering that still matches Python for the operand ranges.
+        left = self._expr(node.left)
+        right = self._expr(node.right)
+        is_div = node.op != "Mod"
+
+        divisor = node.right.value if isinstance(node.right, IRConst) else None
+        if isinstance(divisor, int) and divisor > 0 and divisor & (divisor - 1) == 0:
+            # Arithmetic shift and mask floor toward -inf on two's complement.
+            if is_div:
+                return f"({left} >> {divisor.bit_length() - 1})"
+            return f"({left} & {divisor - 1})"
+
+        left_range = self.ranges.range_of(node.left, self.env)
+        right_range = self.ranges.range_of(node.right, self.env)
+        if (
+            left_range is not None and left_range.is_non_negative()
+            and right_range is not None and right_range.is_non_negative()
+        ):
+            return f"({left} {self._map_op(node.op)} {right})"
+
+        if is_div:
+            self.helpers.add("floordiv")
+            return f"py2c_floordiv({left}, {right})"
+        self.helpers.add("mod")
+        return f"py2c_mod({left}, {right})"
+
     def _map_op(self, op):
         return {
             "Add": "+",
             "Sub": "-",
             "Mult": "*",
             "Div": "/",
+            "FloorDiv": "/",
             "Mod": "%"
         }[op]
+
+
+# ---------- DECLARATION HELPERS ----------
+
+def _bindings(statements, depth):
+    # Assignments and for-loops in emission order, with their block depth
+    for stmt in statements:
+        if isinstance(stmt, (IRAssign, IRFor)):
+            yield stmt, depth
+        if isinstance(stmt, (IRFor, IRWhile)):
+            yield from _bindings(stmt.body, depth + 1)
+        elif isinstance(stmt, IRIf):
+            yield from _bindings(stmt.then_body, depth + 1)
+            yield from _bindings(stmt.else_body, depth + 1)
+
+
+def _use_counts(nodes, counts):
+    # Reads, assignments and loop bindings per variable name
+    for node in nodes:
+        if isinstance(node, IRVar):
+            counts[node.name] = counts.get(node.name, 0) + 1
+        elif isinstance(node, IRAssign):
+            _use_counts([node.target, node.value], counts)
+        elif isinstance(node, IRFor):
+            _use_counts([node.var, node.start, node.end, node.step] + node.body, counts)
+        elif isinstance(node, IRWhile):
+            _use_counts([node.condition] + node.body, counts)
+        elif isinstance(node, IRIf):
+            _use_counts([node.condition] + node.then_body + node.else_body, counts)
+        elif isinstance(node, (IRBinOp, IRCompare)):
+            _use_counts([node.left, node.right], counts)
+        elif isinstance(node, IRBoolOp):
+            _use_counts(node.values, counts)
+        elif isinstance(node, (IRNot, IRReturn)):
+            _use_counts([node.value], counts)
+        elif isinstance(node, IRCall):
+            _use_counts(node.args, counts)
+        elif isinstance(node, IRPrint):
+            _use_counts(node.values, counts)
+    return counts
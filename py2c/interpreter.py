@@ -0,0 +1,287 @@
+from py2c.ir import *
+from py2c.irutils import (
+    INT_MIN,
+    INT_MAX,
+    eval_binop,
+    eval_compare,
+    children,
+    read_names,
+    assigned_names,
+)
+
+
+class EvaluationError(Exception):
+    """Raised when a call cannot (or should not) be evaluated at compile time."""
+
+
+class OutOfFuel(EvaluationError):
+    pass
+
+
+class PurityAnalyzer:
+    """
+    A function is pure if its body contains no IRPrint and only calls
+    functions that are themselves pure. Starts optimistic (everything
+    pure) and removes functions until a fixpoint, so mutual recursion
+    between pure functions stays pure.
+    """
+
+    def analyze(self, functions):
+        pure = set(functions)
+        changed = True
+        while changed:
+            changed = False
+            for name in sorted(pure):
+                if not self._is_pure(functions[name].body, pure):
+                    pure.discard(name)
+                    changed = True
+        return pure
+
+    def _is_pure(self, node, pure):
+        if isinstance(node, list):
+            return all(self._is_pure(n, pure) for n in node)
+        if isinstance(node, IRPrint):
+            return False
+        if isinstance(node, IRCall):
+            if node.name not in pure:
+                return False
+            return self._is_pure(node.args, pure)
+        if isinstance(node, IRFunction):
+            return False  # nested definitions are not supported by codegen
+        return all(self._is_pure(c, pure) for c in children(node))
+
+
+class IRInterpreter:
+    """
+    Fuel-limited evaluator for calls to pure IR functions.
+
+    `call` either returns an int or raises EvaluationError. Every
+    evaluated (function, args) pair is memoized, including failures, so
+    recursive helpers such as `fib(30)` take linear time. A nested call
+    that runs out of fuel is not memoized, since it may have started with
+    little fuel left; a top-level call starts with a full budget, so its
+    failure is final and it is never retried.
+    """
+
+    def __init__(self, functions, fuel=100_000):
+        self.functions = functions
+        self.pure = PurityAnalyzer().analyze(functions)
+        self.fuel_limit = fuel
+        self.fuel = fuel
+        self.memo = {}
+
+    def call(self, name, args):
+        if name not in self.pure:
+            raise EvaluationError(f"{name} is not pure")
+
+        # Only ints have the same meaning in Python and in the generated C
+        if not all(isinstance(a, int) for a in args):
+            raise EvaluationError(f"{name} called with a non-integer argument")
+
+        key = (name, tuple(args))
+        self.fuel = self.fuel_limit
+        try:
+            return self._call(name, key[1])
+        except OutOfFuel as e:
+            self.memo[key] = e
+            raise
+        except RecursionError:
+            self.memo[key] = EvaluationError(f"recursion too deep in {name}")
+            raise self.memo[key]
+
+    # ---------- Calls ----------
+
+    def _call(self, name, args):
+        key = (name, args)
+        if key in self.memo:
+            result = self.memo[key]
+            if isinstance(result, EvaluationError):
+                raise result
+            return result
+
+        func = self.functions.get(name)
+        if func is None or name not in self.pure:
+            raise EvaluationError(f"{name} is not pure")
+        if len(func.params) != len(args):
+            raise EvaluationError(f"{name} expects {len(func.params)} arguments")
+
+        env = {p.name: a for p, a in zip(func.params, args)}
+        try:
+            signal = self._exec_block(func.body, env)
+            if signal is None or signal[0] != "return":
+                raise EvaluationError(f"{name} does not return a value")
+            result = signal[1]
+        except OutOfFuel:
+            raise
+        except EvaluationError as e:
+            self.memo[key] = e
+            raise
+
+        self.memo[key] = result
+        return result
+
+    # ---------- Statements ----------
+
+    def _exec_block(self, statements, env):
+        # Returns None, ("return", value), ("break",) or ("continue",)
+        for stmt in statements:
+            signal = self._exec(stmt, env)
+            if signal is not None:
+                return signal
+        return None
+
+    def _exec(self, node, env):
+        self._burn()
+
+        if isinstance(node, IRAssign):
+            env[node.target.name] = self._eval(node.value, env)
+            return None
+
+        if isinstance(node, IRReturn):
+            return ("return", self._eval(node.value, env))
+
+        if isinstance(node, IRIf):
+            if self._truth(node.condition, env):
+                return self._exec_block(node.then_body, env)
+            return self._exec_block(node.else_body, env)
+
+        if isinstance(node, IRWhile):
+            while self._truth(node.condition, env):
+                signal = self._exec_block(node.body, env)
+                if signal is not None:
+                    if signal[0] == "break":
+                        break
+                    if signal[0] == "return":
+                        return signal
+            return None
+
+        if isinstance(node, IRFor):
+            return self._exec_for(node, env)
+
+        if isinstance(node, IRBreak):
+            return ("break",)
+
+        if isinstance(node, IRContinue):
+            return ("continue",)
+
+        if isinstance(node, IRCall):
+            self._eval(node, env)
+            return None
+
+        if isinstance(node, IRPass):
+            return None
+
+        raise EvaluationError(f"cannot evaluate {type(node).__name__}")
+
+    def _exec_for(self, node, env):
+        # Python evaluates range() once and leaves the loop variable at its
+        # last value; the generated C re-tests the bound and leaves it one
+        # step past. Only evaluate loops where both agree.
+        assigned = assigned_names(node.body)
+        bound_vars = read_names(node.end) | read_names(node.step)
+        if node.var.name in assigned or assigned & bound_vars:
+            raise EvaluationError("loop bounds or variable modified in body")
+
+        start = self._eval(node.start, env)
+        end = self._eval(node.end, env)
+        step = self._eval(node.step, env)
+        if step == 0:
+            raise EvaluationError("range() step cannot be zero")
+
+        for value in range(start, end, step):
+            self._burn()
+            env[node.var.name] = value
+            signal = self._exec_block(node.body, env)
+            if signal is not None:
+                if signal[0] == "break":
+                    break
+                if signal[0] == "return":
+                    return signal
+
+        env.pop(node.var.name, None)
+        return None
+
+    # ---------- Expressions ----------
+
+    def _eval(self, node, env):
+        self._burn()
+
+        if isinstance(node, IRConst):
+            if not isinstance(node.value, int):
+                raise EvaluationError(f"non-integer constant {node.value!r}")
+            return int(node.value)
+
+        if isinstance(node, IRVar):
+            if node.name not in env:
+                raise EvaluationError(f"unbound variable {node.name}")
+            return env[node.name]
+
+        if isinstance(node, IRBinOp):
+            left = self._eval(node.left, env)
+            right = self._eval(node.right, env)
+            return self._check(self._binop(left, node.op, right))
+
+        if isinstance(node, IRCompare):
+            left = self._eval(node.left, env)
+            right = self._eval(node.right, env)
+            return int(_compare(left, node.op, right))
+
+        if isinstance(node, IRBoolOp):
+            # Python yields the deciding operand, C's && / || yield 0 or 1;
+            # the two only agree when that operand is itself 0 or 1.
+            result = self._boolop(node, env, self._eval)
+            if result not in (0, 1):
+                raise EvaluationError("and/or value differs between Python and C")
+            return result
+
+        if isinstance(node, IRNot):
+            return int(not self._truth(node.value, env))
+
+        if isinstance(node, IRCall):
+            args = tuple(self._eval(a, env) for a in node.args)
+            return self._call(node.name, args)
+
+        raise EvaluationError(f"cannot evaluate {type(node).__name__}")
+
+    def _truth(self, node, env):
+        # Conditions only need a truth value, so and/or always evaluate here.
+        if isinstance(node, IRBoolOp):
+            self._burn()
+            return bool(self._boolop(node, env, self._truth))
+        return bool(self._eval(node, env))
+
+    def _boolop(self, node, env, evaluate):
+        result = 0
+        for v in node.values:
+            result = evaluate(v, env)
+            if bool(result) != (node.op == "and"):
+                break
+        return int(result)
+
+    # ---------- Helpers ----------
+
+    def _burn(self):
+        self.fuel -= 1
+        if self.fuel < 0:
+            raise OutOfFuel("out of fuel")
+
+    def _binop(self, left, op, right):
+        try:
+            return eval_binop(left, op, right)
+        except ZeroDivisionError:
+            raise EvaluationError("division by zero")
+        except (TypeError, NotImplementedError) as e:
+            raise EvaluationError(str(e))
+
+    def _check(self, value):
+        # Results must fit the C `int` the call would otherwise have produced
+        if not INT_MIN <= value <= INT_MAX:
+            raise EvaluationError("int overflow")
+        return value
+
+
+def _compare(left, op, right):
+    try:
+        return eval_compare(left, op, right)
+    except (TypeError, NotImplementedError) as e:
+        raise EvaluationError(str(e))
@@ -0,0 +1,113 @@
+from py2c.ir import (
+    IRAssign,
+    IRVar,
+    IRBinOp,
+    IRCompare,
+    IRBoolOp,
+    IRNot,
+    IRReturn,
+    IRCall,
+    IRPrint,
+    IRFor,
+    IRWhile,
+    IRIf,
+    IRFunction,
+)
+
+
+# Range of the C `int` every IR value is compiled to
+INT_MIN = -(2 ** 31)
+INT_MAX = 2 ** 31 - 1
+
+
+# ---------- Operators ----------
+
+def eval_binop(left, op, right):
+    # Python semantics for the integer operators the IR supports
+    if op == "Add":
+        return left + right
+    if op == "Sub":
+        return left - right
+    if op == "Mult":
+        return left * right
+    if op in ("Div", "FloorDiv"):
+        return left // right  # integer semantics
+    if op == "Mod":
+        return left % right
+
+    raise NotImplementedError(f"Unsupported op: {op}")
+
+
+def eval_compare(left, op, right):
+    if op == "<":
+        return left < right
+    if op == ">":
+        return left > right
+    if op == "<=":
+        return left <= right
+    if op == ">=":
+        return left >= right
+    if op == "==":
+        return left == right
+    if op == "!=":
+        return left != right
+
+    raise NotImplementedError(f"Unsupported comparison: {op}")
+
+
+# ---------- Traversal ----------
+
+def children(node):
+    # Direct sub-expressions and sub-statements of `node`
+    if isinstance(node, IRAssign):
+        return [node.value]
+    if isinstance(node, (IRBinOp, IRCompare)):
+        return [node.left, node.right]
+    if isinstance(node, IRBoolOp):
+        return node.values
+    if isinstance(node, (IRNot, IRReturn)):
+        return [node.value]
+    if isinstance(node, IRCall):
+        return node.args
+    if isinstance(node, IRPrint):
+        return node.values
+    if isinstance(node, IRFor):
+        return [node.start, node.end, node.step] + node.body
+    if isinstance(node, IRWhile):
+        return [node.condition] + node.body
+    if isinstance(node, IRIf):
+        return [node.condition] + node.then_body + node.else_body
+    if isinstance(node, IRFunction):
+        return node.body
+    return []
+
+
+def walk(nodes):
+    # Every node in `nodes` and below, in no particular order
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(children(node))
+
+
+def read_counts(statements):
+    counts = {}
+    for node in walk(statements):
+        if isinstance(node, IRVar):
+            counts[node.name] = counts.get(node.name, 0) + 1
+    return counts
+
+
+def read_names(node):
+    return set(read_counts([node]))
+
+
+def assigned_names(statements):
+    names = set()
+    for node in walk(statements):
+        if isinstance(node, IRAssign):
+            names.add(node.target.name)
+        elif isinstance(node, IRFor):
+            names.add(node.var.name)
+    return names
@@ -0,0 +1,343 @@
+from fractions import Fraction
+
+from py2c.ir import *
+from py2c.irutils import INT_MIN, INT_MAX, walk, read_counts, read_names, assigned_names
+
+
+class LoopOptimizer:
+    """
+    Optimizes `IRFor` loops whose bounds are constants.
+
+    In order of preference, a loop is:
+
+    1. Summarized: if every statement is an accumulation `acc = acc +/- e`
+       where `e` is a polynomial in the induction variable (or loop
+       invariant), the loop is replaced by its closed form.
+    2. Fully unrolled: if its trip count is at most `full_unroll_limit`.
+    3. Partially unrolled by `unroll_factor`, with the leftover iterations
+       unrolled after the main loop.
+
+    Unrolled copies reference constants such as `(0 * 2)`; run
+    ConstantFolder afterwards to clean them up. Every transformed loop is
+    recorded in `report`.
+    """
+
+    def __init__(self, full_unroll_limit=8, unroll_factor=4, max_unroll_size=32):
+        self.full_unroll_limit = full_unroll_limit
+        self.unroll_factor = unroll_factor
+        self.max_unroll_size = max_unroll_size  # statements emitted per loop
+        self.report = []
+
+    def optimize(self, ir):
+        if not isinstance(ir, IRProgram):
+            raise TypeError("LoopOptimizer expects IRProgram")
+
+        self.report = []
+        main = [s for s in ir.statements if not isinstance(s, IRFunction)]
+        main_reads = read_counts(main)
+
+        statements = []
+        for stmt in ir.statements:
+            if isinstance(stmt, IRFunction):
+                body = self._block(stmt.body, stmt.name, read_counts(stmt.body))
+                statements.append(IRFunction(stmt.name, stmt.params, body))
+            else:
+                statements.extend(self._block([stmt], "main", main_reads))
+
+        return IRProgram(statements)
+
+    def format_report(self):
+        lines = []
+        for entry in self.report:
+            lines.append(
+                f"{entry['scope']}: for {entry['var']} in range{entry['range']} "
+                f"({entry['trip_count']} iterations) -> {entry['action']}"
+            )
+        return "\n".join(lines)
+
+    # ---------- Traversal ----------
+
+    def _block(self, statements, scope, reads):
+        result = []
+        for stmt in statements:
+            result.extend(self._stmt(stmt, scope, reads))
+        return result
+
+    def _stmt(self, node, scope, reads):
+        if isinstance(node, IRFor):
+            body = self._block(node.body, scope, reads)
+            loop = IRFor(node.var, node.start, node.end, node.step, body)
+            # Reads inside the original body do not make the variable
+            # live after the loop.
+            inside = read_counts(node.body).get(node.var.name, 0)
+            live_after = reads.get(node.var.name, 0) > inside
+            return self._transform(loop, scope, live_after)
+
+        if isinstance(node, IRWhile):
+            return [IRWhile(node.condition, self._block(node.body, scope, reads))]
+
+        if isinstance(node, IRIf):
+            return [IRIf(
+                node.condition,
+                self._block(node.then_body, scope, reads),
+                self._block(node.else_body, scope, reads),
+            )]
+
+        return [node]
+
+    # ---------- Transformations ----------
+
+    def _transform(self, loop, scope, live_after):
+        bounds = [loop.start, loop.end, loop.step]
+        if not all(isinstance(b, IRConst) and isinstance(b.value, int) for b in bounds):
+            return [loop]
+
+        start, end, step = (int(b.value) for b in bounds)
+        if step == 0:
+            return [loop]
+
+        var = loop.var.name
+        assigned = assigned_names(loop.body)
+        if var in assigned or _has_jump(loop.body) or _has_function(loop.body):
+            return [loop]
+
+        trips = len(range(start, end, step))
+        if trips == 0:
+            return []
+
+        # Python leaves the loop variable at its last value
+        tail = [IRAssign(IRVar(var), IRConst(start + (trips - 1) * step))] if live_after else []
+        entry = {
+            "scope": scope,
+            "var": var,
+            "range": (start, end, step),
+            "trip_count": trips,
+        }
+
+        summary = self._closed_form(loop.body, var, assigned, start, step, trips)
+        if summary is not None:
+            self.report.append(dict(entry, action="closed form"))
+            return summary + tail
+
+        size = _size(loop.body)
+        if trips <= self.full_unroll_limit and trips * size <= self.max_unroll_size:
+            self.report.append(dict(entry, action="fully unrolled"))
+            return self._unroll(loop.body, var, range(start, end, step)) + tail
+
+        factor = self.unroll_factor
+        if factor > 1 and trips >= factor and factor * size <= self.max_unroll_size:
+            main_end = start + (trips // factor) * factor * step
+            body = []
+            for j in range(factor):
+                offset = IRBinOp(IRVar(var), "Add", IRConst(j * step)) if j else IRVar(var)
+                body += [_substitute(s, var, offset) for s in loop.body]
+
+            main_loop = IRFor(
+                loop.var, IRConst(start), IRConst(main_end), IRConst(step * factor), body
+            )
+            remainder = self._unroll(loop.body, var, range(main_end, end, step))
+            self.report.append(dict(entry, action=f"unrolled by {factor}"))
+            return [main_loop] + remainder + tail
+
+        return [loop]
+
+    def _unroll(self, body, var, values):
+        result = []
+        for value in values:
+            result += [_substitute(s, var, IRConst(value)) for s in body]
+        return result
+
+    def _closed_form(self, body, var, assigned, start, step, trips):
+        # Scalar evolution: acc = acc + e  ==>  acc = acc + sum(e over range)
+        result = []
+        for stmt in body:
+            if not isinstance(stmt, IRAssign):
+                return None
+
+            acc = stmt.target.name
+            terms = _additive_terms(stmt.value, 1)
+            # acc must appear exactly once, added
+            if [sign for sign, t in terms if _is_var(t, acc)] != [1]:
+                return None
+
+            constant = 0
+            value = IRVar(acc)
+            for sign, term in terms:
+                if _is_var(term, acc):
+                    continue
+
+                term_reads = read_names(term)
+                if acc in term_reads:
+                    return None
+
+                poly = _polynomial(term, var)
+                if poly is not None:
+                    constant += sign * _sum_polynomial(poly, start, step, trips)
+                elif var not in term_reads and not (term_reads & assigned) and not _has_call(term):
+                    op = "Add" if sign > 0 else "Sub"
+                    value = IRBinOp(value, op, IRBinOp(term, "Mult", IRConst(trips)))
+                else:
+                    return None
+
+            # Closed-form totals must still be valid C `int` literals
+            if not INT_MIN <= constant <= INT_MAX:
+                return None
+            if constant:
+                value = IRBinOp(value, "Add" if constant > 0 else "Sub", IRConst(abs(constant)))
+
+            result.append(IRAssign(stmt.target, value))
+
+        return result or None
+
+
+# ---------- Polynomials ----------
+
+def _polynomial(node, var):
+    # Coefficients (lowest degree first) of an integer polynomial in `var`
+    if isinstance(node, IRConst) and isinstance(node.value, int):
+        return [int(node.value)]
+    if isinstance(node, IRVar) and node.name == var:
+        return [0, 1]
+    if isinstance(node, IRBinOp) and node.op in ("Add", "Sub", "Mult"):
+        left = _polynomial(node.left, var)
+        right = _polynomial(node.right, var)
+        if left is None or right is None:
+            return None
+        if node.op == "Mult":
+            product = [0] * (len(left) + len(right) - 1)
+            for i, a in enumerate(left):
+                for j, b in enumerate(right):
+                    product[i + j] += a * b
+            return product
+        sign = 1 if node.op == "Add" else -1
+        size = max(len(left), len(right))
+        left += [0] * (size - len(left))
+        right += [0] * (size - len(right))
+        return [a + sign * b for a, b in zip(left, right)]
+    return None
+
+
+def _sum_polynomial(poly, start, step, trips):
+    # The sum of a degree-d polynomial over the first n iterations is a
+    # polynomial of degree d + 1 in n: sample it at d + 2 points and
+    # evaluate the Lagrange interpolant at n = trips.
+    def p(x):
+        return sum(c * x ** k for k, c in enumerate(poly))
+
+    degree = len(poly) - 1
+    xs = list(range(degree + 2))
+    ys = []
+    total = 0
+    for n in xs:
+        ys.append(total)
+        total += p(start + n * step)
+
+    if trips < len(xs):
+        return ys[trips]
+
+    result = Fraction(0)
+    for i, (xi, yi) in enumerate(zip(xs, ys)):
+        term = Fraction(yi)
+        for j, xj in enumerate(xs):
+            if i != j:
+                term *= Fraction(trips - xj, xi - xj)
+        result += term
+    return int(result)
+
+
+# ---------- IR Helpers ----------
+
+def _additive_terms(node, sign):
+    # Flattens a +/- chain into (sign, operand) pairs
+    if isinstance(node, IRBinOp) and node.op in ("Add", "Sub"):
+        right_sign = sign if node.op == "Add" else -sign
+        return _additive_terms(node.left, sign) + _additive_terms(node.right, right_sign)
+    return [(sign, node)]
+
+
+def _is_var(node, name):
+    return isinstance(node, IRVar) and node.name == name
+
+
+def _substitute(node, name, replacement):
+    # Copy of `node` with reads of variable `name` replaced
+    if isinstance(node, IRVar):
+        return replacement if node.name == name else node
+    if isinstance(node, IRBinOp):
+        return IRBinOp(
+            _substitute(node.left, name, replacement),
+            node.op,
+            _substitute(node.right, name, replacement),
+        )
+    if isinstance(node, IRCompare):
+        return IRCompare(
+            _substitute(node.left, name, replacement),
+            node.op,
+            _substitute(node.right, name, replacement),
+        )
+    if isinstance(node, IRBoolOp):
+        return IRBoolOp(node.op, [_substitute(v, name, replacement) for v in node.values])
+    if isinstance(node, IRNot):
+        return IRNot(_substitute(node.value, name, replacement))
+    if isinstance(node, IRCall):
+        return IRCall(node.name, [_substitute(a, name, replacement) for a in node.args])
+    if isinstance(node, IRAssign):
+        return IRAssign(node.target, _substitute(node.value, name, replacement))
+    if isinstance(node, IRReturn):
+        return IRReturn(_substitute(node.value, name, replacement))
+    if isinstance(node, IRPrint):
+        return IRPrint([_substitute(v, name, replacement) for v in node.values])
+    if isinstance(node, IRIf):
+        return IRIf(
+            _substitute(node.condition, name, replacement),
+            [_substitute(s, name, replacement) for s in node.then_body],
+            [_substitute(s, name, replacement) for s in node.else_body],
+        )
+    if isinstance(node, IRWhile):
+        return IRWhile(
+            _substitute(node.condition, name, replacement),
+            [_substitute(s, name, replacement) for s in node.body],
+        )
+    if isinstance(node, IRFor):
+        # A nested loop over the same name rebinds it inside its body
+        body = node.body
+        if node.var.name != name:
+            body = [_substitute(s, name, replacement) for s in body]
+        return IRFor(
+            node.var,
+            _substitute(node.start, name, replacement),
+            _substitute(node.end, name, replacement),
+            _substitute(node.step, name, replacement),
+            body,
+        )
+    return node
+
+
+def _size(statements):
+    # Statements in one copy of the body, counting nested blocks
+    total = 0
+    for stmt in statements:
+        total += 1
+        if isinstance(stmt, (IRFor, IRWhile)):
+            total += _size(stmt.body)
+        elif isinstance(stmt, IRIf):
+            total += _size(stmt.then_body) + _size(stmt.else_body)
+    return total
+
+
+def _has_call(node):
+    return any(isinstance(n, IRCall) for n in walk([node]))
+
+
+def _has_function(statements):
+    return any(isinstance(n, IRFunction) for n in walk(statements))
+
+
+def _has_jump(statements):
+    # break / continue that would leave *this* loop (nested loops own theirs)
+    for stmt in statements:
+        if isinstance(stmt, (IRBreak, IRContinue)):
+            return True
+        if isinstance(stmt, IRIf) and (_has_jump(stmt.then_body) or _has_jump(stmt.else_body)):
+            return True
+    return False
@@ -13,14 +13,34 @@ from py2c.ir import (
     IRCompare,
     IRNot,
     IRFunction,
+    IRBreak,
+    IRContinue,
 )
+from py2c.interpreter import IRInterpreter, EvaluationError
+from py2c.irutils import eval_binop, eval_compare
+
+
+# Statements after one of these in the same block are unreachable.
+TERMINATORS = (IRReturn, IRBreak, IRContinue)
 
 
 class ConstantFolder:
+    def __init__(self, fuel=100_000):
+        # Per-call interpreter budget for evaluating pure calls
+        self.fuel = fuel
+        self.interpreter = None
+
     def optimize(self, node):
+        # Statements folded away entirely (constant `if`, dead loops) come
+        # back as a list of replacement statements; see `_optimize_block`.
+
         # ---------- Program ----------
         if isinstance(node, IRProgram):
-            return IRProgram([self.optimize(s) for s in node.statements])
+            functions = {
+                s.name: s for s in node.statements if isinstance(s, IRFunction)
+            }
+            self.interpreter = IRInterpreter(functions, self.fuel)
+            return IRProgram(self._optimize_block(node.statements))
 
         # ---------- Assignment ----------
         if isinstance(node, IRAssign):
@@ -32,33 +52,48 @@ class ConstantFolder:
             right = self.optimize(node.right)
 
             if isinstance(left, IRConst) and isinstance(right, IRConst):
-                return IRConst(self._eval(left.value, node.op, right.value))
+                return IRConst(eval_binop(left.value, node.op, right.value))
 
             return IRBinOp(left, node.op, right)
 
         # ---------- For Loop ----------
         if isinstance(node, IRFor):
+            start = self.optimize(node.start)
+            end = self.optimize(node.end)
+            step = self.optimize(node.step)
+
+            if self._is_empty_range(start, end, step):
+                return []
+
             return IRFor(
                 node.var,
-                self.optimize(node.start),
-                self.optimize(node.end),
-                self.optimize(node.step),
-                [self.optimize(s) for s in node.body],
+                start,
+                end,
+                step,
+                self._optimize_block(node.body),
             )
 
         # ---------- While Loop ----------
         if isinstance(node, IRWhile):
-            return IRWhile(
-                self.optimize(node.condition),
-                [self.optimize(s) for s in node.body],
-            )
+            condition = self.optimize(node.condition)
+
+            if isinstance(condition, IRConst) and not condition.value:
+                return []
+
+            return IRWhile(condition, self._optimize_block(node.body))
 
         # ---------- If ----------
         if isinstance(node, IRIf):
+            condition = self.optimize(node.condition)
+
+            if isinstance(condition, IRConst):
+                taken = node.then_body if condition.value else node.else_body
+                return self._optimize_block(taken)
+
             return IRIf(
-                self.optimize(node.condition),
-                [self.optimize(s) for s in node.then_body],
-                [self.optimize(s) for s in node.else_body],
+                condition,
+                self._optimize_block(node.then_body),
+                self._optimize_block(node.else_body),
             )
 
         # ---------- Function ----------
@@ -66,7 +101,7 @@ class ConstantFolder:
             return IRFunction(
                 node.name,
                 node.params,
-                [self.optimize(s) for s in node.body],
+                self._optimize_block(node.body),
             )
 
         # ---------- Return ----------
@@ -79,35 +114,85 @@ class ConstantFolder:
 
         # ---------- Function Call ----------
         if isinstance(node, IRCall):
-            return IRCall(node.name, [self.optimize(a) for a in node.args])
+            args = [self.optimize(a) for a in node.args]
+
+            if self.interpreter and all(isinstance(a, IRConst) for a in args):
+                try:
+                    return IRConst(
+                        self.interpreter.call(node.name, [a.value for a in args])
+                    )
+                except EvaluationError:
+                    pass  # impure, too expensive, or not C-compatible
+
+            return IRCall(node.name, args)
 
         # ---------- Boolean / Compare / Not ----------
         if isinstance(node, IRBoolOp):
-            return IRBoolOp(node.op, [self.optimize(v) for v in node.values])
+            return self._fold_boolop(node)
 
         if isinstance(node, IRCompare):
-            return IRCompare(
-                self.optimize(node.left),
-                node.op,
-                self.optimize(node.right),
-            )
+            left = self.optimize(node.left)
+            right = self.optimize(node.right)
+
+            if isinstance(left, IRConst) and isinstance(right, IRConst):
+                return IRConst(int(eval_compare(left.value, node.op, right.value)))
+
+            return IRCompare(left, node.op, right)
 
         if isinstance(node, IRNot):
-            return IRNot(self.optimize(node.value))
+            value = self.optimize(node.value)
+
+            if isinstance(value, IRConst):
+                return IRConst(int(not value.value))
+
+            return IRNot(value)
 
         # ---------- Constants / Variables ----------
         return node
 
-    def _eval(self, left, op, right):
-        if op == "Add":
-            return left + right
-        if op == "Sub":
-            return left - right
-        if op == "Mult":
-            return left * right
-        if op == "Div":
-            return left // right  # integer semantics
-        if op == "Mod":
-            return left % right
-
-        raise NotImplementedError(f"Unsupported op: {op}")
+    # ---------- Helpers ----------
+
+    def _optimize_block(self, statements):
+        result = []
+        for stmt in statements:
+            new = self.optimize(stmt)
+
+            # A pure call evaluated in statement position has no effect
+            if isinstance(stmt, IRCall) and isinstance(new, IRConst):
+                continue
+
+            result.extend(new if isinstance(new, list) else [new])
+
+            # Drop anything after return / break / continue in this block
+            if result and isinstance(result[-1], TERMINATORS):
+                break
+        return result
+
+    def _fold_boolop(self, node):
+        # Short-circuit: a constant that decides the result ends the chain,
+        # a constant that does not is skipped (unless it is the last value).
+        values = []
+        operands = [self.optimize(v) for v in node.values]
+
+        for i, value in enumerate(operands):
+            if isinstance(value, IRConst):
+                decides = not value.value if node.op == "and" else bool(value.value)
+                if decides or i == len(operands) - 1:
+                    values.append(value)
+                    break
+                continue
+            values.append(value)
+
+        if len(values) == 1:
+            return values[0]
+
+        return IRBoolOp(node.op, values)
+
+    def _is_empty_range(self, start, end, step):
+        if not all(isinstance(n, IRConst) for n in (start, end, step)):
+            return False
+        if step.value > 0:
+            return start.value >= end.value
+        if step.value < 0:
+            return start.value <= end.value
+        return False
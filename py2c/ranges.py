@@ -0,0 +1,234 @@
+from py2c.ir import (
+    IRAssign,
+    IRConst,
+    IRVar,
+    IRBinOp,
+    IRCompare,
+    IRBoolOp,
+    IRNot,
+    IRFor,
+    IRWhile,
+    IRIf,
+)
+
+
+class Interval:
+    """Closed integer interval [lo, hi]; a bound of None means unbounded."""
+
+    def __init__(self, lo, hi):
+        self.lo = lo
+        self.hi = hi
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Interval)
+            and self.lo == other.lo
+            and self.hi == other.hi
+        )
+
+    def __repr__(self):
+        lo = "-inf" if self.lo is None else self.lo
+        hi = "+inf" if self.hi is None else self.hi
+        return f"Interval({lo}, {hi})"
+
+    def is_non_negative(self):
+        return self.lo is not None and self.lo >= 0
+
+    def is_positive(self):
+        return self.lo is not None and self.lo >= 1
+
+    def is_negative(self):
+        return self.hi is not None and self.hi <= -1
+
+
+TOP = Interval(None, None)
+BOOL = Interval(0, 1)
+
+
+class RangeAnalyzer:
+    """
+    Flow-insensitive value-range analysis over one scope of the IR.
+
+    Every variable is given a single interval covering all values it may
+    hold anywhere in the scope. Assignments are joined until a fixpoint is
+    reached; bounds that keep growing are widened to infinity so the
+    iteration always terminates. A variable mapped to None (bottom) is
+    never assigned a known value.
+    """
+
+    WIDEN_AFTER = 3
+
+    def analyze(self, statements, params=()):
+        assigns = []
+        loops = []
+        self._collect(statements, assigns, loops)
+
+        env = {}
+        for p in params:
+            env[p.name] = TOP
+        for target, _ in assigns:
+            env.setdefault(target, None)
+        for loop in loops:
+            env.setdefault(loop.var.name, None)
+
+        rounds = 0
+        changed = True
+        while changed:
+            changed = False
+            rounds += 1
+
+            updates = [(t, self.range_of(v, env)) for t, v in assigns]
+            updates += [(l.var.name, self._loop_var_range(l, env)) for l in loops]
+
+            for name, value in updates:
+                old = env[name]
+                new = _join(old, value)
+                if rounds > self.WIDEN_AFTER:
+                    new = _widen(old, new)
+                if new != old:
+                    env[name] = new
+                    changed = True
+
+        return env
+
+    def range_of(self, node, env):
+        if isinstance(node, IRConst):
+            if isinstance(node.value, int):
+                return Interval(int(node.value), int(node.value))
+            return TOP
+
+        if isinstance(node, IRVar):
+            return env.get(node.name, TOP)
+
+        if isinstance(node, IRBinOp):
+            left = self.range_of(node.left, env)
+            right = self.range_of(node.right, env)
+            if left is None or right is None:
+                return None
+            return _binop(left, node.op, right)
+
+        if isinstance(node, (IRCompare, IRNot)):
+            return BOOL
+
+        if isinstance(node, IRBoolOp):
+            # Python yields an operand, C yields 0/1: cover both.
+            result = BOOL
+            for v in node.values:
+                r = self.range_of(v, env)
+                result = _join(result, TOP if r is None else r)
+            return result
+
+        return TOP
+
+    # ---------- Helpers ----------
+
+    def _collect(self, statements, assigns, loops):
+        for stmt in statements:
+            if isinstance(stmt, IRAssign):
+                assigns.append((stmt.target.name, stmt.value))
+            elif isinstance(stmt, IRFor):
+                loops.append(stmt)
+                self._collect(stmt.body, assigns, loops)
+            elif isinstance(stmt, IRWhile):
+                self._collect(stmt.body, assigns, loops)
+            elif isinstance(stmt, IRIf):
+                self._collect(stmt.then_body, assigns, loops)
+                self._collect(stmt.else_body, assigns, loops)
+            # nested IRFunction bodies are separate scopes
+
+    def _loop_var_range(self, loop, env):
+        start = self.range_of(loop.start, env)
+        end = self.range_of(loop.end, env)
+        if start is None or end is None:
+            return None
+
+        step = loop.step.value if isinstance(loop.step, IRConst) else None
+        if not isinstance(step, int) or step == 0:
+            return TOP
+
+        # The C loop variable also holds its exit value after the loop.
+        if step > 0:
+            hi = None
+            if start.hi is not None and end.hi is not None:
+                hi = max(start.hi, end.hi + step - 1)
+            return Interval(start.lo, hi)
+
+        lo = None
+        if start.lo is not None and end.lo is not None:
+            lo = min(start.lo, end.lo + step + 1)
+        return Interval(lo, start.hi)
+
+
+def _join(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    lo = None if a.lo is None or b.lo is None else min(a.lo, b.lo)
+    hi = None if a.hi is None or b.hi is None else max(a.hi, b.hi)
+    return Interval(lo, hi)
+
+
+def _widen(old, new):
+    if old is None or new is None:
+        return new
+    lo = new.lo if old.lo is not None and new.lo is not None and new.lo >= old.lo else None
+    hi = new.hi if old.hi is not None and new.hi is not None and new.hi <= old.hi else None
+    return Interval(lo, hi)
+
+
+def _add(x, y):
+    return None if x is None or y is None else x + y
+
+
+def _sub(x, y):
+    return None if x is None or y is None else x - y
+
+
+def _binop(a, op, b):
+    if op == "Add":
+        return Interval(_add(a.lo, b.lo), _add(a.hi, b.hi))
+
+    if op == "Sub":
+        return Interval(_sub(a.lo, b.hi), _sub(a.hi, b.lo))
+
+    if op == "Mult":
+        bounds = (a.lo, a.hi, b.lo, b.hi)
+        if None not in bounds:
+            products = [x * y for x in (a.lo, a.hi) for y in (b.lo, b.hi)]
+            return Interval(min(products), max(products))
+        if a.is_non_negative() and b.is_non_negative():
+            hi = None if a.hi is None or b.hi is None else a.hi * b.hi
+            return Interval(a.lo * b.lo, hi)
+        return TOP
+
+    if op in ("Div", "FloorDiv"):
+        # Floor division; only a strictly positive divisor is modelled.
+        if not b.is_positive():
+            return TOP
+        if a.lo is None:
+            lo = None
+        elif a.lo < 0:
+            lo = a.lo // b.lo
+        else:
+            lo = 0 if b.hi is None else a.lo // b.hi
+        if a.hi is None:
+            hi = None
+        elif a.hi >= 0:
+            hi = a.hi // b.lo
+        else:
+            hi = -1 if b.hi is None else a.hi // b.hi
+        return Interval(lo, hi)
+
+    if op == "Mod":
+        # Python modulo takes the sign of the divisor.
+        if b.is_positive():
+            hi = None if b.hi is None else b.hi - 1
+            if a.is_non_negative() and a.hi is not None:
+                hi = a.hi if hi is None else min(hi, a.hi)
+            return Interval(0, hi)
+        if b.is_negative():
+            return Interval(None if b.lo is None else b.lo + 1, 0)
+        return TOP
+
+    return TOP